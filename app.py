@@ -4,9 +4,23 @@ Flask web app per gestione consulenti, competenze, workload e progetti.
 """
 
 import os
+import re
 import json
+import heapq
+import itertools
+import sqlite3
+import time
+from bisect import bisect_left
+from collections import defaultdict
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash
+from functools import cached_property, lru_cache, wraps
+from flask import Flask, render_template, request, redirect, url_for, flash, session
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, configure_mappers, joinedload, selectinload
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 # Get absolute path for instance folder
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -17,12 +31,32 @@ os.makedirs(INSTANCE_PATH, exist_ok=True)
 
 app = Flask(__name__, instance_path=INSTANCE_PATH)
 app.config['SECRET_KEY'] = 'staffing-tool-secret-key-2024'
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(INSTANCE_PATH, "staffing.db")}'
+DATABASE_PATH = os.path.join(INSTANCE_PATH, 'staffing.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DATABASE_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': 10, 'max_overflow': 20, 'pool_pre_ping': True}
 
 from flask_sqlalchemy import SQLAlchemy
 db = SQLAlchemy(app)
 
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Use WAL journaling so commits don't fsync the whole database each time
+    and readers don't block the writer; keep temp tables in memory and
+    memory-map up to 256 MB of the database file.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
+
+
 # =============================================================================
 # MODELS
 # =============================================================================
@@ -31,10 +65,13 @@ class Consultant(db.Model):
     __tablename__ = 'consultant'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
+    summary_json = db.Column(db.Text, nullable=True)  # card summary, refreshed on save
 
     skills = db.relationship('ConsultantSkill', backref='consultant', lazy=True, cascade='all, delete-orphan')
     workloads = db.relationship('MonthlyWorkload', backref='consultant', lazy=True, cascade='all, delete-orphan')
-    projects = db.relationship('ConsultantProject', backref='consultant', lazy=True, cascade='all, delete-orphan')
+    # Most recent first, so "recent projects" is a slice of the loaded collection
+    projects = db.relationship('ConsultantProject', backref='consultant', lazy=True, cascade='all, delete-orphan',
+                               order_by=lambda: (ConsultantProject.end_date_sortable.desc(), ConsultantProject.id))
 
     def __repr__(self):
         return f'<Consultant {self.name}>'
@@ -58,6 +95,10 @@ class ConsultantSkill(db.Model):
     skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False)
     level = db.Column(db.Integer, nullable=False)  # 1-5
 
+    __table_args__ = (
+        db.Index('ix_cs_consultant_skill', 'consultant_id', 'skill_id', unique=True),
+    )
+
     def __repr__(self):
         return f'<ConsultantSkill {self.consultant_id}-{self.skill_id}: {self.level}>'
 
@@ -70,6 +111,10 @@ class MonthlyWorkload(db.Model):
     work_days = db.Column(db.Integer, default=0)
     perceived_load = db.Column(db.Integer, default=0)  # 0-10
 
+    __table_args__ = (
+        db.Index('ix_workload_cid_month', 'consultant_id', 'month', unique=True),
+    )
+
     def __repr__(self):
         return f'<MonthlyWorkload {self.consultant_id} M{self.month}>'
 
@@ -79,7 +124,9 @@ class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), unique=True, nullable=False)
     client = db.Column(db.String(100), nullable=True)
+    client_lc = db.Column(db.String(100), nullable=True, index=True)  # see fold_case()
     domain_tags = db.Column(db.String(500), nullable=True)  # comma-separated
+    domain_tags_lc = db.Column(db.String(500), nullable=True)  # see fold_case()
 
     consultant_projects = db.relationship('ConsultantProject', backref='project', lazy=True)
 
@@ -92,6 +139,16 @@ class Project(db.Model):
             return []
         return [t.strip() for t in self.domain_tags.split(',') if t.strip()]
 
+    @cached_property
+    def tags_set(self):
+        """Return normalized tags as a frozenset, computed once per instance."""
+        return frozenset(normalize_tags(self.domain_tags))
+
+    @cached_property
+    def tags_mask(self):
+        """Return normalized tags as an int bitmask (see tags_to_mask)."""
+        return tags_to_mask(self.tags_set)
+
 
 class ConsultantProject(db.Model):
     __tablename__ = 'consultant_project'
@@ -105,17 +162,50 @@ class ConsultantProject(db.Model):
     end_year = db.Column(db.Integer, nullable=True)
     notes = db.Column(db.Text, nullable=True)
     intensity_level = db.Column(db.Integer, nullable=True)  # 1-5
+    end_date_sortable = db.Column(db.Integer, nullable=True)  # see end_date_sort_key()
+
+    __table_args__ = (
+        db.Index('ix_cp_cid_end_sortable', 'consultant_id', 'end_date_sortable'),
+        db.Index('ix_cp_consultant_project', 'consultant_id', 'project_id'),
+    )
 
     def __repr__(self):
         return f'<ConsultantProject {self.consultant_id}-{self.project_id}>'
 
-    def get_end_date_sortable(self):
-        """Return a sortable tuple for end date, None values sort last."""
-        if self.end_year and self.end_month:
-            return (self.end_year, self.end_month)
-        elif self.end_year:
-            return (self.end_year, 12)
-        return (0, 0)  # No end date, sort last
+
+def fold_case(text):
+    """
+    Return text case-folded for case-insensitive filtering.
+    Done in Python because SQLite's lower()/LIKE only fold ASCII.
+    """
+    return text.casefold() if text else None
+
+
+@event.listens_for(Project, 'before_insert')
+@event.listens_for(Project, 'before_update')
+def set_folded_columns(mapper, connection, target):
+    """Keep client_lc and domain_tags_lc in sync for rows written through the ORM."""
+    target.client_lc = fold_case(target.client)
+    target.domain_tags_lc = fold_case(target.domain_tags)
+
+
+def end_date_sort_key(end_year, end_month):
+    """Return end date as a sortable month count; year-only counts as December, missing sorts last."""
+    if end_year:
+        return end_year * 12 + (end_month or 12)
+    return 0  # No end date, sort last
+
+
+@event.listens_for(ConsultantProject, 'before_insert')
+@event.listens_for(ConsultantProject, 'before_update')
+def set_end_date_sortable(mapper, connection, target):
+    """Keep end_date_sortable in sync for rows written through the ORM."""
+    target.end_date_sortable = end_date_sort_key(target.end_year, target.end_month)
+
+
+# Set up backrefs (ConsultantProject.project, ...) now, so class-level
+# filters can use them before the first query has run
+configure_mappers()
 
 
 # =============================================================================
@@ -133,25 +223,104 @@ DEMO_PROJECTS = [
 
 def seed_base_data():
     """Seed base skills and demo projects if not present."""
-    # Seed skills
-    for skill_name in BASE_SKILLS:
-        existing = Skill.query.filter_by(name=skill_name).first()
-        if not existing:
-            db.session.add(Skill(name=skill_name))
+    # Seed skills (existing names are skipped by the UNIQUE constraint)
+    db.session.execute(
+        sqlite_insert(Skill)
+        .values([{'name': name} for name in BASE_SKILLS])
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
 
     # Seed demo projects
-    for proj_data in DEMO_PROJECTS:
-        existing = Project.query.filter_by(name=proj_data['name']).first()
-        if not existing:
-            db.session.add(Project(
-                name=proj_data['name'],
-                client=proj_data['client'],
-                domain_tags=proj_data['domain_tags']
-            ))
+    db.session.execute(
+        sqlite_insert(Project)
+        .values([
+            {**project,
+             'client_lc': fold_case(project['client']),
+             'domain_tags_lc': fold_case(project['domain_tags'])}
+            for project in DEMO_PROJECTS
+        ])
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+
+    db.session.commit()
+
 
+# Schema setup runs in every WSGI worker at import (see wsgi.py), so each
+# step below must tolerate another worker having just done the same thing.
+
+def ensure_tables():
+    """Create missing tables (CREATE TABLE IF NOT EXISTS); indexes are left to ensure_indexes()."""
+    for table in db.metadata.sorted_tables:
+        db.session.execute(CreateTable(table, if_not_exists=True))
+    db.session.commit()
+
+
+def ensure_columns():
+    """Add columns missing from tables created before they existed (CREATE TABLE never alters)."""
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                try:
+                    db.session.execute(db.text(
+                        f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                    ))
+                    db.session.commit()
+                except OperationalError as e:
+                    db.session.rollback()
+                    if 'duplicate column name' not in str(e.orig):
+                        raise
+
+
+def backfill_derived_columns():
+    """Fill precomputed columns left empty by rows written before they existed."""
+    db.session.execute(
+        update(ConsultantProject)
+        .where(ConsultantProject.end_date_sortable.is_(None))
+        .values(end_date_sortable=db.case(
+            (ConsultantProject.end_year > 0,
+             ConsultantProject.end_year * 12 + db.func.coalesce(ConsultantProject.end_month, 12)),
+            else_=0
+        ))
+    )
+    # Folded in Python, see fold_case()
+    for project in Project.query.filter(
+            ((Project.client_lc.is_(None)) & (Project.client.isnot(None)))
+            | ((Project.domain_tags_lc.is_(None)) & (Project.domain_tags.isnot(None)))).all():
+        project.client_lc = fold_case(project.client)
+        project.domain_tags_lc = fold_case(project.domain_tags)
+    for consultant in Consultant.query.filter(Consultant.summary_json.is_(None)).all():
+        consultant.summary_json = json.dumps(build_consultant_summary(consultant))
     db.session.commit()
 
 
+def ensure_indexes():
+    """
+    Create declared indexes missing from tables created before they existed.
+    Duplicate rows that would violate a new UNIQUE index are removed first,
+    keeping the lowest-id row per key: the one the app has always read and
+    updated (via .first()), so later copies are stale.
+    """
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                key_columns = list(index.columns)
+                keep_ids = select(db.func.min(table.c.id)).group_by(*key_columns)
+                removed = db.session.execute(table.delete().where(table.c.id.not_in(keep_ids))).rowcount
+                db.session.commit()
+                if removed:
+                    app.logger.warning('Removed %d duplicate %s rows before creating %s',
+                                       removed, table.name, index.name)
+            db.session.execute(CreateIndex(index, if_not_exists=True))
+            db.session.commit()
+
+
 # =============================================================================
 # SCORING FUNCTIONS
 # =============================================================================
@@ -165,13 +334,10 @@ def calculate_workload_score(work_days, perceived_load):
     work_days = max(0, int(work_days or 0))
     perceived_load = max(0, min(10, int(perceived_load or 0)))
 
-    workload_score = work_days + (perceived_load * 0.3)
-    max_score = 23.0
-    workload_percent = min(100, round(workload_score / max_score * 100))
-    availability_percent = 100 - workload_percent
+    workload_score, workload_percent, availability_percent = _workload_score_cached(work_days, perceived_load)
 
     return {
-        'workload_score': round(workload_score, 1),
+        'workload_score': workload_score,
         'workload_percent': workload_percent,
         'availability_percent': availability_percent,
         'work_days': work_days,
@@ -179,6 +345,15 @@ def calculate_workload_score(work_days, perceived_load):
     }
 
 
+@lru_cache(maxsize=256)
+def _workload_score_cached(work_days, perceived_load):
+    """Return (workload_score, workload_percent, availability_percent) for clamped inputs."""
+    workload_score = work_days + (perceived_load * 0.3)
+    max_score = 23.0
+    workload_percent = min(100, round(workload_score / max_score * 100))
+    return round(workload_score, 1), workload_percent, 100 - workload_percent
+
+
 def calculate_skill_fit(consultant_skills_dict, required_skills):
     """
     Calculate skill fit score (0-100).
@@ -188,19 +363,15 @@ def calculate_skill_fit(consultant_skills_dict, required_skills):
     if not required_skills:
         return 100
 
-    per_skill_scores = []
+    total = 0.0
     for skill_id, required_level in required_skills:
         consultant_level = consultant_skills_dict.get(skill_id, 0)
         if required_level > 0:
-            score = min(1.0, consultant_level / required_level)
-        else:
-            score = 1.0 if consultant_level > 0 else 0.0
-        per_skill_scores.append(score)
+            total += min(1.0, consultant_level / required_level)
+        elif consultant_level > 0:
+            total += 1.0
 
-    if per_skill_scores:
-        avg_score = sum(per_skill_scores) / len(per_skill_scores)
-        return round(avg_score * 100)
-    return 0
+    return round(total / len(required_skills) * 100)
 
 
 def normalize_tags(tags_string):
@@ -210,7 +381,36 @@ def normalize_tags(tags_string):
     return set(t.strip().lower() for t in tags_string.split(',') if t.strip())
 
 
-def calculate_recency_factor(end_year, end_month):
+# Recency buckets: months since project end (<=6, <=18, <=36, more)
+RECENCY_BOUNDS = (6, 18, 36)
+RECENCY_FACTORS = (1.0, 0.85, 0.70, 0.60)
+RECENCY_LABELS = ("Ultimo semestre", "Ultimo anno e mezzo", "Ultimi 3 anni", "Più di 3 anni fa")
+
+
+def current_month_index():
+    """Return the current date as an absolute month count (year*12 + month)."""
+    now = datetime.now()
+    return now.year * 12 + now.month
+
+
+# Bit assigned to each normalized tag, allocated on first sight. Python ints
+# are unbounded, so the vocabulary is not capped at 64 tags.
+TAG_BITS = {}
+_next_tag_bit = itertools.count()
+
+
+def tags_to_mask(tags):
+    """Encode a set of normalized tags as an int bitmask, so overlap is a popcount."""
+    mask = 0
+    for tag in tags:
+        bit = TAG_BITS.get(tag)
+        if bit is None:
+            bit = TAG_BITS.setdefault(tag, 1 << next(_next_tag_bit))
+        mask |= bit
+    return mask
+
+
+def calculate_recency_factor(end_year, end_month, now_months=None):
     """
     Calculate recency factor (0.6..1.0).
     <=6 months: 1.0
@@ -222,18 +422,14 @@ def calculate_recency_factor(end_year, end_month):
     if not end_year or not end_month:
         return 0.75
 
-    now = datetime.now()
-    end_date = datetime(end_year, end_month, 1)
-    months_since = (now.year - end_date.year) * 12 + (now.month - end_date.month)
-
-    if months_since <= 6:
-        return 1.0
-    elif months_since <= 18:
-        return 0.85
-    elif months_since <= 36:
-        return 0.70
-    else:
-        return 0.60
+    if now_months is None:
+        now_months = current_month_index()
+    months_since = now_months - (end_year * 12 + end_month)
+    return RECENCY_FACTORS[bisect_left(RECENCY_BOUNDS, months_since)]
+
+
+# Intensity factors indexed by intensity level (index 0 = missing)
+INTENSITY_FACTORS = (0.85, 0.70, 0.80, 0.88, 0.95, 1.00)
 
 
 def calculate_intensity_factor(intensity_level):
@@ -242,44 +438,57 @@ def calculate_intensity_factor(intensity_level):
     1->0.70, 2->0.80, 3->0.88, 4->0.95, 5->1.00
     Missing: 0.85
     """
-    if intensity_level is None:
-        return 0.85
+    if intensity_level is not None and 1 <= intensity_level <= 5:
+        return INTENSITY_FACTORS[intensity_level]
+    return INTENSITY_FACTORS[0]
+
 
-    intensity_map = {1: 0.70, 2: 0.80, 3: 0.88, 4: 0.95, 5: 1.00}
-    return intensity_map.get(intensity_level, 0.85)
+def describe_recency(end_year, end_month, now_months=None):
+    """Describe how long ago a project ended (Italian label)."""
+    if not end_year or not end_month:
+        return "Date non specificate"
+
+    if now_months is None:
+        now_months = current_month_index()
+    months_since = now_months - (end_year * 12 + end_month)
+    return RECENCY_LABELS[bisect_left(RECENCY_BOUNDS, months_since)]
 
 
-def calculate_project_similarity(consultant_projects, reference_project):
+def calculate_project_similarity(consultant_projects, reference_project, now_months=None):
     """
     Calculate project similarity score (0-100) for a consultant.
+    now_months: current_month_index(), computed once per request by callers.
     Returns (score, best_match_info).
     """
     if not reference_project or not consultant_projects:
         return 0, None
 
     client_ref = (reference_project.client or '').strip().lower()
-    tags_ref = normalize_tags(reference_project.domain_tags)
+    mask_ref = reference_project.tags_mask
+    n_tags_ref = len(reference_project.tags_set)
+    if now_months is None:
+        now_months = current_month_index()
 
     best_similarity = 0
-    best_match_info = None
+    best = None  # (consultant_project, client_match, common_tags)
 
     for cp in consultant_projects:
         project = cp.project
         client_past = (project.client or '').strip().lower()
-        tags_past = normalize_tags(project.domain_tags)
 
         # (A) Client match
         client_match = 1 if (client_past and client_ref and client_past == client_ref) else 0
 
         # (B) Tag overlap
-        if tags_ref:
-            common_tags = tags_ref & tags_past
-            tag_overlap = len(common_tags) / len(tags_ref)
+        if mask_ref:
+            common_tags = (mask_ref & project.tags_mask).bit_count()
+            tag_overlap = common_tags / n_tags_ref
         else:
+            common_tags = 0
             tag_overlap = 0
 
         # (C) Recency factor
-        recency = calculate_recency_factor(cp.end_year, cp.end_month)
+        recency = calculate_recency_factor(cp.end_year, cp.end_month, now_months)
 
         # (D) Intensity factor
         intensity_factor = calculate_intensity_factor(cp.intensity_level)
@@ -292,35 +501,23 @@ def calculate_project_similarity(consultant_projects, reference_project):
 
         if similarity > best_similarity:
             best_similarity = similarity
+            best = (cp, client_match, common_tags)
 
-            # Recency bucket description
-            if not cp.end_year or not cp.end_month:
-                recency_desc = "Date non specificate"
-            else:
-                now = datetime.now()
-                end_date = datetime(cp.end_year, cp.end_month, 1)
-                months = (now.year - end_date.year) * 12 + (now.month - end_date.month)
-                if months <= 6:
-                    recency_desc = "Ultimo semestre"
-                elif months <= 18:
-                    recency_desc = "Ultimo anno e mezzo"
-                elif months <= 36:
-                    recency_desc = "Ultimi 3 anni"
-                else:
-                    recency_desc = "Più di 3 anni fa"
-
-            common_tags = tags_ref & tags_past
-
-            best_match_info = {
-                'project_name': project.name,
-                'project_id': project.id,
-                'client_match': client_match == 1,
-                'common_tags': len(common_tags),
-                'total_ref_tags': len(tags_ref),
-                'recency_desc': recency_desc,
-                'intensity': cp.intensity_level,
-                'role': cp.role
-            }
+    if best is None:
+        return 0, None
+
+    # Build the match description only for the winning project
+    cp, client_match, common_tags = best
+    best_match_info = {
+        'project_name': cp.project.name,
+        'project_id': cp.project.id,
+        'client_match': client_match == 1,
+        'common_tags': common_tags,
+        'total_ref_tags': n_tags_ref,
+        'recency_desc': describe_recency(cp.end_year, cp.end_month, now_months),
+        'intensity': cp.intensity_level,
+        'role': cp.role
+    }
 
     return round(best_similarity * 100), best_match_info
 
@@ -341,50 +538,89 @@ def calculate_final_score(skill_fit, availability, project_experience=None):
 # HELPER FUNCTIONS
 # =============================================================================
 
+def query_consultants_with_details():
+    """Consultant query eager-loading skills and projects (avoids N+1 lazy loads)."""
+    return Consultant.query.options(
+        selectinload(Consultant.skills).joinedload(ConsultantSkill.skill),
+        selectinload(Consultant.projects).joinedload(ConsultantProject.project)
+    )
+
+
+def load_consultants_for_ranking():
+    """
+    Load all consultants with skills, workloads and projects eagerly,
+    so scoring a roster costs a constant number of queries.
+    """
+    return query_consultants_with_details().options(
+        selectinload(Consultant.workloads)
+    ).all()
+
+
+def build_scoring_inputs(consultants, month):
+    """
+    Extract scoring inputs once per request, as lists aligned with consultants:
+    'skills' ({skill_id: level}) and 'workloads' (workload data for month).
+    """
+    return {
+        'skills': [get_consultant_skills_dict(c) for c in consultants],
+        'workloads': [get_month_workload(c, month) for c in consultants]
+    }
+
+
 def get_consultant_skills_dict(consultant):
     """Get consultant skills as {skill_id: level} dict."""
     return {cs.skill_id: cs.level for cs in consultant.skills}
 
 
-def get_consultant_workload_for_month(consultant, month):
-    """Get workload data for a specific month."""
-    workload = MonthlyWorkload.query.filter_by(
-        consultant_id=consultant.id,
-        month=month
-    ).first()
-
-    if workload:
-        return calculate_workload_score(workload.work_days, workload.perceived_load)
+def get_month_workload(consultant, month):
+    """Get workload data for a month from the consultant's loaded workloads."""
+    for wl in consultant.workloads:
+        if wl.month == month:
+            return calculate_workload_score(wl.work_days, wl.perceived_load)
     return calculate_workload_score(0, 0)
 
 
 def get_top_skills(consultant, min_level=3, limit=5):
     """Get consultant's top skills (level >= min_level)."""
-    skills = []
-    for cs in consultant.skills:
-        if cs.level >= min_level:
-            skills.append({
-                'name': cs.skill.name,
-                'level': cs.level
-            })
-    skills.sort(key=lambda x: x['level'], reverse=True)
-    return skills[:limit]
+    return heapq.nlargest(
+        limit,
+        ({'name': cs.skill.name, 'level': cs.level} for cs in consultant.skills if cs.level >= min_level),
+        key=lambda x: x['level']
+    )
+
+
+def build_consultant_summary(consultant):
+    """
+    Compute the card summary stored in Consultant.summary_json: top skills,
+    recent projects and the average of the top 3 skill levels (chart Y axis).
+    """
+    top3 = get_top_skills(consultant, min_level=1, limit=3)
+    return {
+        'top_skills': get_top_skills(consultant),
+        'recent_projects': get_recent_projects(consultant),
+        'skill_level': round(sum(s['level'] for s in top3) / len(top3), 1) if top3 else 0
+    }
+
+
+def get_consultant_summary(consultant):
+    """Get the stored card summary, computing it if it was never saved."""
+    if consultant.summary_json:
+        return json.loads(consultant.summary_json)
+    return build_consultant_summary(consultant)
 
 
 def get_recent_projects(consultant, limit=2):
-    """Get consultant's most recent projects."""
-    projects = []
-    for cp in consultant.projects:
-        projects.append({
+    """Get consultant's most recent projects (consultant.projects is ordered by end date desc)."""
+    return [
+        {
             'id': cp.project.id,
             'name': cp.project.name,
             'role': cp.role,
             'end_year': cp.end_year,
-            'end_month': cp.end_month,
-            'sort_key': cp.get_end_date_sortable()
-        })
-    projects.sort(key=lambda x: x['sort_key'], reverse=True)
-    return projects[:limit]
+            'end_month': cp.end_month
+        }
+        for cp in consultant.projects[:limit]
+    ]
 
 
 def safe_int(value, default=0, min_val=None, max_val=None):
@@ -402,20 +638,100 @@ def safe_int(value, default=0, min_val=None, max_val=None):
     return result
 
 
+EXPERIENCE_FIELD_RE = re.compile(r'exp_(\d+)_(\w+)$')
+
+
+def group_experience_fields(form):
+    """Group exp_<i>_<field> form values by row in one pass: {i: {field: value}}."""
+    rows = defaultdict(dict)
+    for key, value in form.items():
+        match = EXPERIENCE_FIELD_RE.match(key)
+        if match:
+            rows[int(match.group(1))][match.group(2)] = value
+    return rows
+
+
+MONTH_NAMES = (
+    'Gennaio', 'Febbraio', 'Marzo', 'Aprile',
+    'Maggio', 'Giugno', 'Luglio', 'Agosto',
+    'Settembre', 'Ottobre', 'Novembre', 'Dicembre'
+)
+
+
 def get_month_name(month_num):
     """Get Italian month name."""
-    months = {
-        1: 'Gennaio', 2: 'Febbraio', 3: 'Marzo', 4: 'Aprile',
-        5: 'Maggio', 6: 'Giugno', 7: 'Luglio', 8: 'Agosto',
-        9: 'Settembre', 10: 'Ottobre', 11: 'Novembre', 12: 'Dicembre'
-    }
-    return months.get(month_num, str(month_num))
+    if 1 <= month_num <= 12:
+        return MONTH_NAMES[month_num - 1]
+    return str(month_num)
+
+
+# Compact encoder for the chart payloads embedded in templates, built once
+encode_chart_data = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
 
 
 # Make helper available in templates
 app.jinja_env.globals['get_month_name'] = get_month_name
 
 
+# Rendered pages of read-only views, keyed by URL and database version
+PAGE_CACHE_TIMEOUT = 60  # seconds
+PAGE_CACHE_MAX_ENTRIES = 256
+_page_cache = {}
+_commit_count = 0  # commits made by this process, see get_db_version()
+
+
+@event.listens_for(Session, 'after_commit')
+def count_commit(db_session):
+    global _commit_count
+    _commit_count += 1
+
+
+def get_db_version():
+    """
+    Return a version that changes on every commit, so cached pages are
+    invalidated by writes: this process's commit count, plus the mtime and
+    size of the SQLite file and its WAL for commits from other processes
+    (mtimes alone tick too coarsely to tell back-to-back commits apart).
+    """
+    version = [_commit_count]
+    for path in (DATABASE_PATH, DATABASE_PATH + '-wal'):
+        try:
+            stat = os.stat(path)
+            version.extend((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.extend((0, 0))
+    return tuple(version)
+
+
+def cached_page(view):
+    """Cache the HTML of a read-only GET view for PAGE_CACHE_TIMEOUT seconds."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Pending flash messages are rendered (and consumed) by the page itself
+        if request.method != 'GET' or '_flashes' in session:
+            return view(*args, **kwargs)
+
+        key = (request.full_path, get_db_version())
+        now = time.monotonic()
+        hit = _page_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+
+        response = view(*args, **kwargs)
+        if isinstance(response, str):
+            if len(_page_cache) >= PAGE_CACHE_MAX_ENTRIES:
+                _page_cache.clear()
+            _page_cache[key] = (now + PAGE_CACHE_TIMEOUT, response)
+        return response
+    return wrapper
+
+
+def precompile_templates():
+    """Compile every template into the Jinja cache so first requests skip it."""
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -449,141 +765,161 @@ def inserisci():
             db.session.add(consultant)
             db.session.flush()  # Get the ID
 
-        # Handle new skill creation
-        new_skill_name = request.form.get('new_skill_name', '').strip()
-        new_skill_level = safe_int(request.form.get('new_skill_level'), 0, 0, 5)
-
-        if new_skill_name:
-            existing_skill = Skill.query.filter_by(name=new_skill_name).first()
-            if not existing_skill:
-                existing_skill = Skill(name=new_skill_name)
-                db.session.add(existing_skill)
-                db.session.flush()
-
-            if new_skill_level >= 1:
-                # Add or update consultant skill
-                cs = ConsultantSkill.query.filter_by(
-                    consultant_id=consultant.id,
-                    skill_id=existing_skill.id
-                ).first()
-                if cs:
-                    cs.level = new_skill_level
+        # Everything below is written in one batch at commit: explicit flushes
+        # (for new IDs) are the only ones needed, so skip autoflush on each query
+        with db.session.no_autoflush:
+            # Current skill levels, diffed in memory against the submitted form
+            existing_skills = {
+                cs.skill_id: cs
+                for cs in ConsultantSkill.query.filter_by(consultant_id=consultant.id).all()
+            }
+            skills_to_insert = {}  # skill_id -> level
+            skill_ids_to_delete = []
+
+            # Handle new skill creation
+            new_skill_name = request.form.get('new_skill_name', '').strip()
+            new_skill_level = safe_int(request.form.get('new_skill_level'), 0, 0, 5)
+
+            if new_skill_name:
+                existing_skill = Skill.query.filter_by(name=new_skill_name).first()
+                if not existing_skill:
+                    existing_skill = Skill(name=new_skill_name)
+                    db.session.add(existing_skill)
+                    db.session.flush()
+
+                if new_skill_level >= 1:
+                    # Add or update consultant skill
+                    cs = existing_skills.get(existing_skill.id)
+                    if cs:
+                        cs.level = new_skill_level
+                    else:
+                        skills_to_insert[existing_skill.id] = new_skill_level
+
+            # Update skills
+            all_skills = Skill.query.all()
+            for skill in all_skills:
+                level_key = f'skill_level_{skill.id}'
+                level = safe_int(request.form.get(level_key), 0, 0, 5)
+
+                existing_cs = existing_skills.get(skill.id)
+
+                if level >= 1:
+                    if existing_cs:
+                        existing_cs.level = level
+                    else:
+                        skills_to_insert[skill.id] = level
                 else:
-                    db.session.add(ConsultantSkill(
-                        consultant_id=consultant.id,
-                        skill_id=existing_skill.id,
-                        level=new_skill_level
-                    ))
-
-        # Update skills
-        all_skills = Skill.query.all()
-        for skill in all_skills:
-            level_key = f'skill_level_{skill.id}'
-            level = safe_int(request.form.get(level_key), 0, 0, 5)
-
-            existing_cs = ConsultantSkill.query.filter_by(
-                consultant_id=consultant.id,
-                skill_id=skill.id
-            ).first()
-
-            if level >= 1:
-                if existing_cs:
-                    existing_cs.level = level
+                    # Remove skill if level is 0 or empty
+                    skills_to_insert.pop(skill.id, None)
+                    if existing_cs:
+                        skill_ids_to_delete.append(existing_cs.id)
+
+            if skills_to_insert:
+                db.session.execute(insert(ConsultantSkill), [
+                    {'consultant_id': consultant.id, 'skill_id': skill_id, 'level': level}
+                    for skill_id, level in skills_to_insert.items()
+                ])
+            if skill_ids_to_delete:
+                ConsultantSkill.query.filter(
+                    ConsultantSkill.id.in_(skill_ids_to_delete)
+                ).delete(synchronize_session='evaluate')
+
+            # Update monthly workload: one batched UPSERT for all 12 months
+            workload_rows = [
+                {
+                    'consultant_id': consultant.id,
+                    'month': month,
+                    'work_days': safe_int(request.form.get(f'work_days_{month}'), 0, 0),
+                    'perceived_load': safe_int(request.form.get(f'perceived_{month}'), 0, 0, 10)
+                }
+                for month in range(1, 13)
+            ]
+            upsert = sqlite_insert(MonthlyWorkload)
+            db.session.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=['consultant_id', 'month'],
+                    set_={
+                        'work_days': upsert.excluded.work_days,
+                        'perceived_load': upsert.excluded.perceived_load
+                    }
+                ),
+                workload_rows
+            )
+
+            # Handle new project creation
+            new_project_name = request.form.get('new_project_name', '').strip()
+            new_project_client = request.form.get('new_project_client', '').strip()
+            new_project_tags = request.form.get('new_project_tags', '').strip()
+
+            new_project = None
+            if new_project_name:
+                existing_proj = Project.query.filter_by(name=new_project_name).first()
+                if not existing_proj:
+                    new_project = Project(
+                        name=new_project_name,
+                        client=new_project_client,
+                        domain_tags=new_project_tags
+                    )
+                    db.session.add(new_project)
+                    db.session.flush()
                 else:
-                    db.session.add(ConsultantSkill(
-                        consultant_id=consultant.id,
-                        skill_id=skill.id,
-                        level=level
-                    ))
-            else:
-                # Remove skill if level is 0 or empty
-                if existing_cs:
-                    db.session.delete(existing_cs)
-
-        # Update monthly workload
-        for month in range(1, 13):
-            work_days = safe_int(request.form.get(f'work_days_{month}'), 0, 0)
-            perceived = safe_int(request.form.get(f'perceived_{month}'), 0, 0, 10)
-
-            existing_wl = MonthlyWorkload.query.filter_by(
-                consultant_id=consultant.id,
-                month=month
-            ).first()
-
-            if existing_wl:
-                existing_wl.work_days = work_days
-                existing_wl.perceived_load = perceived
-            else:
-                db.session.add(MonthlyWorkload(
-                    consultant_id=consultant.id,
-                    month=month,
-                    work_days=work_days,
-                    perceived_load=perceived
-                ))
-
-        # Handle new project creation
-        new_project_name = request.form.get('new_project_name', '').strip()
-        new_project_client = request.form.get('new_project_client', '').strip()
-        new_project_tags = request.form.get('new_project_tags', '').strip()
-
-        new_project = None
-        if new_project_name:
-            existing_proj = Project.query.filter_by(name=new_project_name).first()
-            if not existing_proj:
-                new_project = Project(
-                    name=new_project_name,
-                    client=new_project_client,
-                    domain_tags=new_project_tags
-                )
-                db.session.add(new_project)
-                db.session.flush()
-            else:
-                new_project = existing_proj
-
-        # Handle project experiences (multiple rows)
-        exp_count = safe_int(request.form.get('exp_count'), 0)
-        for i in range(exp_count + 1):  # +1 for potential new project experience
-            prefix = f'exp_{i}_'
-            project_id = request.form.get(f'{prefix}project_id')
-
-            # Check if this is the new project row
-            if i == exp_count and new_project:
-                project_id = str(new_project.id)
-
-            if not project_id or project_id == '':
-                continue
+                    new_project = existing_proj
+
+            # Handle project experiences (multiple rows), inserted in one batch
+            project_rows = []
+            exp_count = safe_int(request.form.get('exp_count'), 0)
+            exp_rows = group_experience_fields(request.form)
+            for i in range(exp_count + 1):  # +1 for potential new project experience
+                fields = exp_rows.get(i, {})
+                project_id = fields.get('project_id')
+
+                # Check if this is the new project row
+                if i == exp_count and new_project:
+                    project_id = str(new_project.id)
+
+                if not project_id or project_id == '':
+                    continue
+
+                project_id = safe_int(project_id, 0)
+                if project_id <= 0:
+                    continue
+
+                role = fields.get('role', '').strip()
+                start_month = safe_int(fields.get('start_month'), None)
+                start_year = safe_int(fields.get('start_year'), None)
+                end_month = safe_int(fields.get('end_month'), None)
+                end_year = safe_int(fields.get('end_year'), None)
+                intensity = safe_int(fields.get('intensity'), None)
+                notes = fields.get('notes', '').strip()
+
+                # Validate months
+                if start_month is not None and (start_month < 1 or start_month > 12):
+                    start_month = None
+                if end_month is not None and (end_month < 1 or end_month > 12):
+                    end_month = None
+                if intensity is not None and (intensity < 1 or intensity > 5):
+                    intensity = None
+
+                project_rows.append({
+                    'consultant_id': consultant.id,
+                    'project_id': project_id,
+                    'role': role if role else None,
+                    'start_month': start_month,
+                    'start_year': start_year,
+                    'end_month': end_month,
+                    'end_year': end_year,
+                    'intensity_level': intensity,
+                    'notes': notes if notes else None,
+                    'end_date_sortable': end_date_sort_key(end_year, end_month)
+                })
 
-            project_id = safe_int(project_id, 0)
-            if project_id <= 0:
-                continue
+            if project_rows:
+                db.session.execute(insert(ConsultantProject), project_rows)
 
-            role = request.form.get(f'{prefix}role', '').strip()
-            start_month = safe_int(request.form.get(f'{prefix}start_month'), None)
-            start_year = safe_int(request.form.get(f'{prefix}start_year'), None)
-            end_month = safe_int(request.form.get(f'{prefix}end_month'), None)
-            end_year = safe_int(request.form.get(f'{prefix}end_year'), None)
-            intensity = safe_int(request.form.get(f'{prefix}intensity'), None)
-            notes = request.form.get(f'{prefix}notes', '').strip()
-
-            # Validate months
-            if start_month is not None and (start_month < 1 or start_month > 12):
-                start_month = None
-            if end_month is not None and (end_month < 1 or end_month > 12):
-                end_month = None
-            if intensity is not None and (intensity < 1 or intensity > 5):
-                intensity = None
-
-            db.session.add(ConsultantProject(
-                consultant_id=consultant.id,
-                project_id=project_id,
-                role=role if role else None,
-                start_month=start_month,
-                start_year=start_year,
-                end_month=end_month,
-                end_year=end_year,
-                intensity_level=intensity,
-                notes=notes if notes else None
-            ))
+        # Refresh the precomputed card summary from the rows just written
+        db.session.flush()
+        db.session.expire(consultant, ['skills', 'projects'])
+        consultant.summary_json = json.dumps(build_consultant_summary(consultant))
 
         db.session.commit()
         flash(f'Consulente "{consultant_name}" salvato con successo!', 'success')
@@ -612,11 +948,12 @@ def inserisci():
     # Prepare consultants list with details
     consultants_list = []
     for c in consultants:
+        summary = get_consultant_summary(c)
         consultants_list.append({
             'id': c.id,
             'name': c.name,
-            'top_skills': get_top_skills(c),
-            'recent_projects': get_recent_projects(c)
+            'top_skills': summary['top_skills'],
+            'recent_projects': summary['recent_projects']
         })
 
     return render_template('inserisci.html',
@@ -630,9 +967,12 @@ def inserisci():
 
 
 @app.route('/consultant/<int:consultant_id>')
+@cached_page
 def consultant_profile(consultant_id):
     """Consultant profile page."""
-    consultant = Consultant.query.get_or_404(consultant_id)
+    consultant = query_consultants_with_details().options(
+        selectinload(Consultant.workloads)
+    ).filter_by(id=consultant_id).first_or_404()
 
     # Skills sorted by level desc
     skills = []
@@ -644,12 +984,10 @@ def consultant_profile(consultant_id):
     skills.sort(key=lambda x: x['level'], reverse=True)
 
     # Workloads
+    workload_by_month = {wl.month: wl for wl in consultant.workloads}
     workloads = []
     for month in range(1, 13):
-        wl = MonthlyWorkload.query.filter_by(
-            consultant_id=consultant.id,
-            month=month
-        ).first()
+        wl = workload_by_month.get(month)
 
         if wl:
             score_data = calculate_workload_score(wl.work_days, wl.perceived_load)
@@ -675,13 +1013,11 @@ def consultant_profile(consultant_id):
             'end_month': cp.end_month,
             'end_year': cp.end_year,
             'intensity': cp.intensity_level,
-            'notes': cp.notes,
-            'sort_key': cp.get_end_date_sortable()
+            'notes': cp.notes
         })
-    projects.sort(key=lambda x: x['sort_key'], reverse=True)
 
     # Chart data for workload
-    chart_data = json.dumps({
+    chart_data = encode_chart_data({
         'labels': [w['month_name'] for w in workloads],
         'workload': [w['workload_percent'] for w in workloads],
         'availability': [w['availability_percent'] for w in workloads]
@@ -707,6 +1043,7 @@ def delete_consultant(consultant_id):
 
 
 @app.route('/projects', methods=['GET', 'POST'])
+@cached_page
 def projects():
     """Projects catalog page."""
     if request.method == 'POST':
@@ -734,25 +1071,29 @@ def projects():
     client_filter = request.args.get('client', '').strip()
     tag_filter = request.args.get('tag', '').strip()
 
-    query = Project.query
+    query = Project.query.options(
+        selectinload(Project.consultant_projects).joinedload(ConsultantProject.consultant)
+    )
 
     if search:
         query = query.filter(Project.name.ilike(f'%{search}%'))
     if client_filter:
-        query = query.filter(Project.client.ilike(f'%{client_filter}%'))
+        query = query.filter(Project.client_lc.contains(client_filter.casefold()))
     if tag_filter:
-        query = query.filter(Project.domain_tags.ilike(f'%{tag_filter}%'))
+        query = query.filter(Project.domain_tags_lc.contains(tag_filter.casefold()))
 
     all_projects = query.order_by(Project.name).all()
 
-    # Get unique clients and tags for filters
-    all_clients = set()
+    # Get unique clients and tags for filters (distinct values only, no Project rows)
+    all_clients = {
+        client for (client,) in db.session.query(Project.client).filter(
+            Project.client.isnot(None), Project.client != ''
+        ).distinct()
+    }
     all_tags = set()
-    for p in Project.query.all():
-        if p.client:
-            all_clients.add(p.client)
-        for tag in p.get_tags_list():
-            all_tags.add(tag)
+    for (domain_tags,) in db.session.query(Project.domain_tags).filter(
+            Project.domain_tags.isnot(None)).distinct():
+        all_tags.update(t.strip() for t in domain_tags.split(',') if t.strip())
 
     # Prepare projects with consultants who worked on them
     projects_list = []
@@ -783,6 +1124,7 @@ def projects():
 
 
 @app.route('/overview')
+@cached_page
 def overview():
     """Account workload overview page."""
     # Get filter parameters
@@ -795,91 +1137,90 @@ def overview():
     tag_filter = request.args.get('tag', '').strip()
     view = request.args.get('view', 'cards')
 
-    # Start with all consultants
-    query = Consultant.query
+    client_lc = fold_case(client_filter)
+    tag_lower = tag_filter.lower()
 
+    # Filters run in SQL as EXISTS subqueries, so rejected consultants are never read
+    conditions = []
     if search:
-        query = query.filter(Consultant.name.ilike(f'%{search}%'))
-
-    consultants = query.order_by(Consultant.name).all()
-
-    # Apply filters and calculate data
-    results = []
-    for c in consultants:
-        # Skill filter
-        if skill_id > 0:
-            cs = ConsultantSkill.query.filter_by(
-                consultant_id=c.id,
-                skill_id=skill_id
-            ).first()
-            if not cs or cs.level < min_level:
-                continue
+        conditions.append(Consultant.name.ilike(f'%{search}%'))
+    if skill_id > 0:
+        conditions.append(Consultant.skills.any(
+            (ConsultantSkill.skill_id == skill_id) & (ConsultantSkill.level >= min_level)
+        ))
+    if project_id > 0:
+        conditions.append(Consultant.projects.any(ConsultantProject.project_id == project_id))
+    if client_filter:
+        conditions.append(Consultant.projects.any(
+            ConsultantProject.project.has(Project.client_lc == client_lc)
+        ))
+    if tag_filter:
+        # Substring match here; whole-tag match is confirmed below
+        conditions.append(Consultant.projects.any(
+            ConsultantProject.project.has(Project.domain_tags_lc.contains(tag_filter.casefold()))
+        ))
+
+    # Read-only page: fetch plain row tuples instead of hydrating ORM objects;
+    # card contents come from the summary stored on save
+    consultant_rows = db.session.execute(
+        select(Consultant.id, Consultant.name, Consultant.summary_json)
+        .where(*conditions).order_by(Consultant.name)
+    ).all()
+    selected_ids = select(Consultant.id).where(*conditions)
+
+    workloads = {
+        cid: (work_days, perceived_load)
+        for cid, work_days, perceived_load in db.session.execute(
+            select(MonthlyWorkload.consultant_id, MonthlyWorkload.work_days, MonthlyWorkload.perceived_load)
+            .where(MonthlyWorkload.month == month, MonthlyWorkload.consultant_id.in_(selected_ids))
+        )
+    }
 
-        # Project filter
-        if project_id > 0:
-            has_project = ConsultantProject.query.filter_by(
-                consultant_id=c.id,
-                project_id=project_id
-            ).first()
-            if not has_project:
-                continue
+    # Selected skill level per consultant (for chart Y axis)
+    selected_skill_levels = {}
+    if skill_id > 0:
+        selected_skill_levels = dict(db.session.execute(
+            select(ConsultantSkill.consultant_id, ConsultantSkill.level)
+            .where(ConsultantSkill.skill_id == skill_id, ConsultantSkill.consultant_id.in_(selected_ids))
+        ).all())
 
-        # Client filter
-        if client_filter:
-            has_client = False
-            for cp in c.projects:
-                if cp.project.client and cp.project.client.lower() == client_filter.lower():
-                    has_client = True
-                    break
-            if not has_client:
-                continue
+    # Project tags per consultant, only needed to confirm whole-tag matches
+    tags_by_consultant = defaultdict(list)
+    if tag_filter:
+        for cid, domain_tags in db.session.execute(
+                select(ConsultantProject.consultant_id, Project.domain_tags)
+                .join(Project)
+                .where(ConsultantProject.consultant_id.in_(selected_ids))):
+            tags_by_consultant[cid].append(domain_tags)
 
-        # Tag filter
-        if tag_filter:
-            has_tag = False
-            tag_lower = tag_filter.lower()
-            for cp in c.projects:
-                for t in cp.project.get_tags_list():
-                    if t.lower() == tag_lower:
-                        has_tag = True
-                        break
-                if has_tag:
-                    break
-            if not has_tag:
-                continue
+    # Calculate data
+    results = []
+    for cid, name, summary_json in consultant_rows:
+        if tag_filter and not any(tag_lower in normalize_tags(tags) for tags in tags_by_consultant[cid]):
+            continue
 
         # Calculate workload
-        workload_data = get_consultant_workload_for_month(c, month)
-
-        # Get skill level for selected skill (for chart Y axis)
-        skill_level = 0
-        if skill_id > 0:
-            cs = ConsultantSkill.query.filter_by(
-                consultant_id=c.id,
-                skill_id=skill_id
-            ).first()
-            if cs:
-                skill_level = cs.level
+        workload_data = calculate_workload_score(*workloads.get(cid, (0, 0)))
+
+        if summary_json:
+            summary = json.loads(summary_json)
         else:
-            # Average of top 3 skills
-            top = get_top_skills(c, min_level=1, limit=3)
-            if top:
-                skill_level = round(sum(s['level'] for s in top) / len(top), 1)
+            summary = build_consultant_summary(db.session.get(Consultant, cid))
 
         results.append({
-            'id': c.id,
-            'name': c.name,
+            'id': cid,
+            'name': name,
             'workload_data': workload_data,
-            'top_skills': get_top_skills(c),
-            'recent_projects': get_recent_projects(c),
-            'skill_level': skill_level
+            'top_skills': summary['top_skills'],
+            'recent_projects': summary['recent_projects'],
+            'skill_level': selected_skill_levels.get(cid, 0) if skill_id > 0 else summary['skill_level']
         })
 
     # Sort by lowest workload (highest availability)
     results.sort(key=lambda x: x['workload_data']['workload_percent'])
 
     # Prepare chart data
-    chart_data = json.dumps({
+    chart_data = encode_chart_data({
         'consultants': [
             {
                 'id': r['id'],
@@ -932,7 +1273,7 @@ def match():
     all_projects = Project.query.order_by(Project.name).all()
 
     results = []
-    chart_data = json.dumps({'consultants': []})
+    chart_data = encode_chart_data({'consultants': []})
 
     # Form state
     month = safe_int(request.args.get('month') or request.form.get('month'),
@@ -951,20 +1292,19 @@ def match():
         if str(skill.id) in selected_skill_ids:
             required_skills.append((skill.id, level))
 
+    skills_by_id = {skill.id: skill for skill in all_skills}
+
     reference_project = None
     if reference_project_id > 0:
         reference_project = Project.query.get(reference_project_id)
 
     if request.method == 'POST':
-        consultants = Consultant.query.all()
+        consultants = load_consultants_for_ranking()
+        inputs = build_scoring_inputs(consultants, month)
+        now_months = current_month_index()
 
-        for c in consultants:
-            # Calculate skill fit
-            c_skills = get_consultant_skills_dict(c)
+        for c, c_skills, workload_data in zip(consultants, inputs['skills'], inputs['workloads']):
             skill_fit = calculate_skill_fit(c_skills, required_skills)
-
-            # Calculate availability
-            workload_data = get_consultant_workload_for_month(c, month)
             availability = workload_data['availability_percent']
 
             # Calculate project similarity if reference project selected
@@ -972,7 +1312,7 @@ def match():
             best_match_info = None
             if reference_project:
                 project_experience, best_match_info = calculate_project_similarity(
-                    c.projects, reference_project
+                    c.projects, reference_project, now_months
                 )
 
             # Calculate final score
@@ -981,7 +1321,7 @@ def match():
             # Skill breakdown
             skill_breakdown = []
             for skill_id, req_level in required_skills:
-                skill = Skill.query.get(skill_id)
+                skill = skills_by_id[skill_id]
                 consultant_level = c_skills.get(skill_id, 0)
                 skill_breakdown.append({
                     'name': skill.name,
@@ -990,6 +1330,7 @@ def match():
                     'met': consultant_level >= req_level
                 })
 
+            summary = get_consultant_summary(c)
             results.append({
                 'id': c.id,
                 'name': c.name,
@@ -1000,15 +1341,15 @@ def match():
                 'best_match_info': best_match_info,
                 'skill_breakdown': skill_breakdown,
                 'workload_data': workload_data,
-                'top_skills': get_top_skills(c),
-                'recent_projects': get_recent_projects(c)
+                'top_skills': summary['top_skills'],
+                'recent_projects': summary['recent_projects']
             })
 
         # Sort by final score desc
         results.sort(key=lambda x: x['final_score'], reverse=True)
 
         # Prepare chart data
-        chart_data = json.dumps({
+        chart_data = encode_chart_data({
             'consultants': [
                 {
                     'id': r['id'],
@@ -1057,9 +1398,20 @@ def admin_reset_db():
 # MAIN
 # =============================================================================
 
-if __name__ == '__main__':
+def init_app():
+    """Create tables and indexes, seed base data and precompile templates."""
     with app.app_context():
-        db.create_all()
+        ensure_tables()
+        ensure_columns()
+        ensure_indexes()
+        backfill_derived_columns()
         seed_base_data()
+        # Don't hand connections opened here to forked WSGI workers
+        db.engine.dispose()
+    precompile_templates()
 
-    app.run(debug=True, port=5000)
+
+if __name__ == '__main__':
+    # Development server only; production runs wsgi.py under a WSGI server
+    init_app()
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000)
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers, e.g.:
+    gunicorn --preload -w 4 -k gthread --threads 4 wsgi:application
+    waitress-serve --threads=8 wsgi:application
+"""
+
+from app import app, init_app
+
+init_app()
+application = app